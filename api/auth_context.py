@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+AUTH_CONTEXT_CACHE_TIMEOUT = 60
+USER_FIELDS = ("id", "username", "password", "is_active", "is_staff", "is_superuser")
+
+@dataclass(frozen=True)
+class AuthContext:
+    """Everything CustomJWTAuthentication needs to know about the owner of a
+    token, resolved in one place so that further per-request checks
+    (e.g. token revocation) can be loaded together with the user instead of
+    adding another database round trip each.
+
+    Attributes:
+        user (django.contrib.auth.models.User):
+            The token owner, loaded with USER_FIELDS only.
+
+    Note:
+        The user is partial and read-only. Reading a field outside
+        USER_FIELDS (e.g. `email`, `last_login`) runs an extra query, and the
+        instance may be up to AUTH_CONTEXT_CACHE_TIMEOUT seconds old: with a
+        per-process cache, changes saved by another worker are not seen until
+        the entry expires. Code that modifies the user must re-fetch it
+        (`User.objects.get(pk=request.user.pk)`) instead of calling
+        `request.user.save()`, which would write stale values back.
+    """
+    user: User
+
+def auth_context_cache_key(user_id):
+    """Return the cache key under which the AuthContext for `user_id` is stored."""
+    return f"auth:ctx:{user_id}"
+
+def get_auth_context(user_id):
+    """Resolve the AuthContext for `user_id`.
+
+    The context is looked up in the Django cache first. On a miss, all data is
+    fetched from the database in a single pass and the result is cached for
+    AUTH_CONTEXT_CACHE_TIMEOUT seconds. Cached entries are invalidated by the
+    User signal handlers in `api.signals`.
+
+    Parameters:
+        user_id (int):
+            The `user_id` claim of an already verified token.
+
+    Returns:
+        AuthContext | None:
+            The context, or None if the user does not exist.
+    """
+    key = auth_context_cache_key(user_id)
+    context = cache.get(key)
+    if context is not None:
+        return context
+
+    user = User.objects.only(*USER_FIELDS).filter(id=user_id).first()
+    if user is None:
+        return None
+    context = AuthContext(user=user)
+    cache.set(key, context, timeout=AUTH_CONTEXT_CACHE_TIMEOUT)
+    return context
@@ -1,8 +1,24 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
-from django.contrib.auth.models import User
+from .auth_context import get_auth_context
 from .jwt_utils import decode_token
 
+def get_jwt_payload(request):
+    """Return the JWT payload stored on `request` by CustomJWTAuthentication.
+
+    DRF authenticates a request only once and caches the result, but code
+    running outside the view (middleware, renderers, helpers that receive the
+    plain HttpRequest) does not have `request.auth`. The payload is therefore
+    also stored on the request itself, so it can be reused without decoding
+    the token again.
+
+    Returns:
+        dict | None:
+            The decoded payload, or None if the request was not authenticated
+            with a JWT.
+    """
+    return getattr(request, "_jwt_payload", None)
+
 class CustomJWTAuthentication(BaseAuthentication):
     """Custom authentication class for Django REST Framework that validates
     JSON Web Tokens passed through the `Authorization` HTTP header.
@@ -40,9 +56,11 @@ class CustomJWTAuthentication(BaseAuthentication):
            and extract the payload.
         5. Confirm that the token type is "access", since refresh tokens
            must not be used for authentication.
-        6. Attempt to find a User model instance using the user_id
-           stored in the token payload.
-        7. If everything is valid, return the Django user and the payload.
+        6. Resolve the user stored in the token payload via
+           `get_auth_context()`, which serves it from the cache when possible.
+           The returned user is partial and read-only (see `AuthContext`).
+        7. If everything is valid, store the payload on the request (see
+           `get_jwt_payload()`) and return the Django user and the payload.
 
         Parameters:
             request (rest_framework.request.Request):
@@ -81,14 +99,17 @@ class CustomJWTAuthentication(BaseAuthentication):
         if not auth_header:
             return None
 
-        try:
-            keyword, token = auth_header.split()
-        except ValueError:
-            raise exceptions.AuthenticationFailed("Invalid Authorization header format. Use 'Bearer <token>'.")
-
-        if keyword != self.keyword:
+        if not auth_header.startswith(self.keyword):
+            return None
+        rest = auth_header[len(self.keyword):]
+        if rest and not rest[0].isspace():
             return None
 
+        parts = rest.split()
+        if len(parts) != 1:
+            raise exceptions.AuthenticationFailed("Invalid Authorization header format. Use 'Bearer <token>'.")
+        token = parts[0]
+
         try:
             payload = decode_token(token)
         except Exception as e:
@@ -101,9 +122,10 @@ class CustomJWTAuthentication(BaseAuthentication):
         if not user_id:
             raise exceptions.AuthenticationFailed("Invalid payload: user_id missing.")
 
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
+        context = get_auth_context(user_id)
+        if context is None:
             raise exceptions.AuthenticationFailed("User not found.")
 
-        return (user, payload)
\ No newline at end of file
+        request._jwt_payload = payload
+        request._request._jwt_payload = payload
+        return (context.user, payload)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .auth_context import auth_context_cache_key
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the cached AuthContext used by CustomJWTAuthentication whenever the
+    user row changes or is deleted, so that updated credentials, flags or
+    a removed account take effect on the next request.
+
+    The delete runs after the surrounding transaction commits; otherwise a
+    concurrent request could re-cache the old row before the change is
+    visible to it."""
+    key = auth_context_cache_key(instance.pk)
+    transaction.on_commit(lambda: cache.delete(key))
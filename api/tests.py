@@ -1,3 +1,289 @@
-from django.test import TestCase
+import time
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import jwt_utils
+from .auth_context import auth_context_cache_key, get_auth_context
+from .authentication import CustomJWTAuthentication, get_jwt_payload
+from .jwt_utils import decode_token, generate_access_token, generate_refresh_token
+
+
+class JWTTestCase(SimpleTestCase):
+    """Base class for `jwt_utils` tests: starts every test with empty decode
+    caches and uses PyJWT as the reference implementation."""
+
+    def setUp(self):
+        jwt_utils._decode_cache.clear()
+        jwt_utils._rejected_cache.clear()
+        self.user = SimpleNamespace(id=42)
+
+    def encode(self, payload, **kwargs):
+        return jwt.encode(payload, jwt_utils.SECRET_KEY, algorithm=jwt_utils.ALGORITHM, **kwargs)
+
+
+class TokenMintingTests(JWTTestCase):
+    """Tests for the direct HMAC signer used by `generate_*_token()`."""
+
+    def test_minted_tokens_match_pyjwt(self):
+        now = 1_700_000_000
+        with mock.patch.object(jwt_utils.time, "time", return_value=now + 0.5):
+            access = generate_access_token(self.user)
+            refresh = generate_refresh_token(self.user)
+
+        self.assertEqual(access, self.encode({
+            "user_id": 42, "exp": now + jwt_utils.ACCESS_SECONDS, "type": "access", "iat": now,
+        }))
+        self.assertEqual(refresh, self.encode({
+            "user_id": 42, "exp": now + jwt_utils.REFRESH_SECONDS, "type": "refresh", "iat": now,
+        }))
+
+    def test_minted_token_round_trips(self):
+        payload = decode_token(generate_access_token(self.user))
+        self.assertEqual(payload["user_id"], 42)
+        self.assertEqual(payload["type"], "access")
+
+
+class FastPathVerifyTests(JWTTestCase):
+    """Tests for `_decode_fast()`, the direct HMAC verifier for self-issued
+    tokens, and its fallback to PyJWT."""
+
+    def test_tampered_signature_is_rejected(self):
+        header, body, signature = generate_access_token(self.user).split(".")
+        middle = len(signature) // 2
+        flipped = "A" if signature[middle] != "A" else "B"
+        token = ".".join((header, body, signature[:middle] + flipped + signature[middle + 1:]))
+
+        with self.assertRaises(jwt.InvalidSignatureError):
+            jwt_utils._decode_fast(token)
+        with self.assertRaises(jwt.InvalidSignatureError):
+            decode_token(token)
+
+    def test_tampered_payload_is_rejected(self):
+        header, _, signature = generate_access_token(self.user).split(".")
+        forged = jwt_utils._b64url_encode(b'{"user_id":1,"exp":9999999999,"type":"access"}')
+        with self.assertRaises(jwt.InvalidSignatureError):
+            decode_token(".".join((header, forged, signature)))
+
+    def test_expired_token_is_rejected_by_fast_path(self):
+        with mock.patch.object(jwt_utils.time, "time", return_value=time.time() - 3600):
+            token = generate_access_token(self.user)
+
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            jwt_utils._decode_fast(token)
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            decode_token(token)
+
+    def test_token_with_extra_claims_falls_back_to_pyjwt(self):
+        token = self.encode({"user_id": 42, "type": "access", "exp": int(time.time()) + 60, "aud": "other"})
+        self.assertIsNone(jwt_utils._decode_fast(token))
+        with self.assertRaises(jwt.InvalidAudienceError):
+            decode_token(token)
+
+    def test_token_with_foreign_header_falls_back_to_pyjwt(self):
+        token = self.encode({"user_id": 42, "type": "access", "exp": int(time.time()) + 60}, headers={"kid": "k1"})
+        self.assertIsNone(jwt_utils._decode_fast(token))
+        with mock.patch("jwt.decode", wraps=jwt.decode) as pyjwt_decode:
+            payload = decode_token(token)
+        pyjwt_decode.assert_called_once()
+        self.assertEqual(payload["user_id"], 42)
+
+class TokenPrecheckTests(JWTTestCase):
+    """Tests for the structural and type checks at the top of `decode_token()`."""
+
+    def test_malformed_and_non_string_tokens_raise_decode_error(self):
+        for token in ("garbage", "a.b", "a" * 5000 + ".b.c", 123, None):
+            with self.subTest(token=token):
+                with self.assertRaises(jwt.DecodeError):
+                    decode_token(token)
+
+    def test_bytes_token_is_accepted(self):
+        token = generate_access_token(self.user).encode("utf-8")
+        self.assertEqual(decode_token(token)["user_id"], 42)
+
+    def test_malformed_token_is_rejected_before_hashing(self):
+        with mock.patch.object(jwt_utils, "_token_fingerprint") as fingerprint:
+            with self.assertRaises(jwt.DecodeError):
+                decode_token("not-a-jwt")
+        fingerprint.assert_not_called()
+
+
+class DecodeCacheTests(JWTTestCase):
+    """Tests for the cache of verified payloads in `decode_token()`."""
+
+    def test_repeated_token_is_served_from_cache(self):
+        token = generate_access_token(self.user)
+        decode_token(token)
+        with mock.patch.object(jwt_utils, "_decode_fast") as fast:
+            self.assertEqual(decode_token(token)["user_id"], 42)
+        fast.assert_not_called()
+
+    def test_expired_token_is_rejected_after_cache_hit(self):
+        token = generate_access_token(self.user)
+        decode_token(token)
+        self.assertEqual(len(jwt_utils._decode_cache), 1)
+
+        later = time.time() + jwt_utils.ACCESS_SECONDS + 1
+        with mock.patch.object(jwt_utils.time, "time", return_value=later):
+            with self.assertRaises(jwt.ExpiredSignatureError):
+                decode_token(token)
+
+    def test_non_numeric_exp_is_not_cached(self):
+        token = self.encode({"user_id": 42, "type": "access", "exp": str(int(time.time()) + 60)})
+        self.assertEqual(decode_token(token)["user_id"], 42)
+        self.assertEqual(len(jwt_utils._decode_cache), 0)
+        self.assertEqual(decode_token(token)["user_id"], 42)
+
+
+class RejectedTokenCacheTests(JWTTestCase):
+    """Tests for the short-lived cache of rejected tokens in `decode_token()`."""
+
+    def test_rejected_token_is_served_from_cache(self):
+        token = self.encode({"user_id": 42, "type": "access", "exp": int(time.time()) + 60})
+        token = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+        with self.assertRaises(jwt.InvalidSignatureError):
+            decode_token(token)
+        with mock.patch.object(jwt_utils, "_decode_fast") as fast:
+            with self.assertRaises(jwt.InvalidSignatureError):
+                decode_token(token)
+        fast.assert_not_called()
+
+    def test_not_yet_valid_token_is_not_cached_as_rejected(self):
+        now = int(time.time())
+        token = self.encode({"user_id": 42, "type": "access", "exp": now + 60, "iat": now + 2})
+        with self.assertRaises(jwt.ImmatureSignatureError):
+            decode_token(token)
+        self.assertEqual(len(jwt_utils._rejected_cache), 0)
+
+        # Once the clock catches up the token must be verified again.
+        with mock.patch("jwt.decode", return_value={"user_id": 42, "exp": now + 60}) as pyjwt_decode:
+            self.assertEqual(decode_token(token)["user_id"], 42)
+        pyjwt_decode.assert_called_once()
+
+
+class AuthContextCacheTests(TestCase):
+    """Tests for the cached user lookup behind CustomJWTAuthentication and its
+    invalidation through the User signals."""
+
+    def setUp(self):
+        cache.clear()
+        jwt_utils._decode_cache.clear()
+        jwt_utils._rejected_cache.clear()
+        self.user = User.objects.create_user("alice", password="secret-pass-1")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + generate_access_token(self.user))
+
+    def test_second_request_is_served_without_queries(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/protected/")
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/protected/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_save_invalidates_cached_context(self):
+        get_auth_context(self.user.id)
+        self.assertIsNotNone(cache.get(auth_context_cache_key(self.user.id)))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertIsNone(cache.get(auth_context_cache_key(self.user.id)))
+
+    def test_delete_invalidates_cached_context(self):
+        self.assertEqual(self.client.get("/api/protected/").status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertIsNone(cache.get(auth_context_cache_key(self.user.id)))
+
+        response = self.client.get("/api/protected/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["detail"], "User not found.")
+
+
+class CustomJWTAuthenticationTests(TestCase):
+    """Tests for `CustomJWTAuthentication.authenticate()` called directly."""
+
+    def setUp(self):
+        cache.clear()
+        jwt_utils._decode_cache.clear()
+        jwt_utils._rejected_cache.clear()
+        self.user = User.objects.create_user("bob", password="secret-pass-1")
+        self.token = generate_access_token(self.user)
+
+    def make_request(self, authorization):
+        http_request = APIRequestFactory().get("/api/protected/", HTTP_AUTHORIZATION=authorization)
+        return Request(http_request)
+
+    def test_payload_is_stored_on_request(self):
+        request = self.make_request("Bearer " + self.token)
+        user, payload = CustomJWTAuthentication().authenticate(request)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(get_jwt_payload(request), payload)
+        self.assertEqual(get_jwt_payload(request._request), payload)
+        self.assertEqual(payload["user_id"], self.user.pk)
+
+    def test_unauthenticated_request_has_no_payload(self):
+        request = self.make_request("")
+        self.assertIsNone(CustomJWTAuthentication().authenticate(request))
+        self.assertIsNone(get_jwt_payload(request._request))
+
+    def test_other_schemes_are_not_attempted(self):
+        for header in ("Basic a b", "Bearerx y"):
+            with self.subTest(header=header):
+                self.assertIsNone(CustomJWTAuthentication().authenticate(self.make_request(header)))
+
+    def test_malformed_bearer_header_is_rejected(self):
+        for header in ("Bearer", "Bearer a b"):
+            with self.subTest(header=header):
+                with self.assertRaisesMessage(exceptions.AuthenticationFailed, "Invalid Authorization header format"):
+                    CustomJWTAuthentication().authenticate(self.make_request(header))
+
+    def test_any_whitespace_after_keyword_is_accepted(self):
+        user, payload = CustomJWTAuthentication().authenticate(self.make_request("Bearer\t" + self.token))
+        self.assertEqual(user.pk, self.user.pk)
+
+
+class TokenRefreshViewTests(TestCase):
+    """Tests for how TokenRefreshView reads the refresh token from the body."""
+
+    url = "/api/token/refresh/"
+
+    def setUp(self):
+        jwt_utils._decode_cache.clear()
+        jwt_utils._rejected_cache.clear()
+        self.user = User.objects.create_user("carol", password="secret-pass-1")
+        self.refresh = generate_refresh_token(self.user)
+        self.client = APIClient()
+
+    def test_json_body(self):
+        response = self.client.post(self.url, {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode_token(response.data["access"])["user_id"], self.user.pk)
+
+    def test_malformed_json_is_rejected(self):
+        response = self.client.post(self.url, "{not json", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["detail"], "Invalid JSON")
+
+    def test_non_object_json_is_rejected(self):
+        response = self.client.post(self.url, "[1, 2]", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["detail"], "Refresh token required")
+
+    def test_non_string_refresh_token_is_unauthorized(self):
+        response = self.client.post(self.url, {"refresh": 5}, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Invalid token type", response.data["detail"])
+
+    def test_form_encoded_body_uses_request_data(self):
+        with mock.patch("api.views.orjson") as views_orjson:
+            response = self.client.post(self.url, {"refresh": self.refresh})
+        views_orjson.loads.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
@@ -1,3 +1,5 @@
+import orjson
+from types import SimpleNamespace
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
@@ -53,6 +55,7 @@ class TokenRefreshView(APIView):
     def post(self,request):
         """
         1. Ensure "refresh" is present in request body (else 400).
+           JSON bodies are read with orjson; malformed JSON is a 400.
         2. Decode and validate the refresh token via `decode_token()`.
            - On decode error → return 401 Unauthorized.
         3. Verify token type is "refresh" (else 400).
@@ -61,7 +64,7 @@ class TokenRefreshView(APIView):
 
         Returns:
             200 OK with {"access": "<new_access_token>"}
-            400 Bad Request if token type is invalid or "refresh" missing
+            400 Bad Request if token type is invalid, "refresh" missing or JSON malformed
             401 Unauthorized if token is invalid/expired
             404 Not Found if user doesn’t exist
 
@@ -69,7 +72,16 @@ class TokenRefreshView(APIView):
         - Refresh tokens must be transmitted only over HTTPS.
         - Production systems often store issued refresh tokens for revocation support.
         """
-        refresh_token = request.data.get("refresh")
+        # JSON bodies are parsed directly: only one field is needed, so DRF's
+        # parser negotiation is skipped. Other content types use request.data.
+        if request.content_type.startswith("application/json"):
+            try:
+                body = orjson.loads(request.body)
+            except orjson.JSONDecodeError:
+                return Response({"detail": "Invalid JSON"}, status=status.HTTP_400_BAD_REQUEST)
+            refresh_token = body.get("refresh") if isinstance(body, dict) else None
+        else:
+            refresh_token = request.data.get("refresh")
         if not refresh_token:
             return Response({"detail": "Refresh token required"}, status=status.HTTP_400_BAD_REQUEST)
         try: 
@@ -80,12 +92,11 @@ class TokenRefreshView(APIView):
             return Response({"detail": "Token is not refresh token"}, status=status.HTTP_400_BAD_REQUEST)
         
         user_id = payload.get("user_id")
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
+        if not User.objects.filter(id=user_id).exists():
             return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        access = generate_access_token(user)
+        # generate_access_token() only reads `id`, so there is no need to load the user row.
+        access = generate_access_token(SimpleNamespace(id=user_id))
         return Response({"access": access})
     
 class ProtectedView(APIView):